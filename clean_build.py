@@ -3,83 +3,315 @@
 清理构建和开发文件的工具
 """
 
+import fnmatch
 import os
+import re
 import shutil
-import glob
+import subprocess
 
-def clean_directory(directory="."):
-    """清理指定目录中的构建文件"""
-
-    # 需要清理的文件和目录模式
-    patterns = [
-        # Python 编译文件
-        "**/__pycache__",
-        "**/*.pyc",
-        "**/*.pyo",
-        "**/*.pyd",
-        "**/.pytest_cache",
-        "**/.mypy_cache",
-        "**/.coverage",
-        "**/*.cover",
-
-        # 构建产物
-        "build/",
-        "dist/",
-        "*.egg-info",
-        "*.egg",
-
-        # 测试报告
-        "htmlcov/",
-        ".coverage",
-        ".coverage.*",
-
-        # 编辑器缓存
-        ".vscode/",
-        "**/*.swp",
-        "**/*.swo",
-        "**/*~",
-
-        # macOS
-        "**/.DS_Store",
-
-        # setuptools_scm 生成的文件
-        "xpyun_sdk/_version.py",
-
-        # 自动生成的文件
-        "**/.eggs/",
-    ]
-
-    cleaned_files = []
+# 需要清理的文件和目录模式
+CLEAN_PATTERNS = [
+    # Python 编译文件
+    "**/__pycache__",
+    "**/*.pyc",
+    "**/*.pyo",
+    "**/*.pyd",
+    "**/.pytest_cache",
+    "**/.mypy_cache",
+    "**/.coverage",
+    "**/*.cover",
+
+    # 构建产物
+    "build/",
+    "dist/",
+    "*.egg-info",
+    "*.egg",
+
+    # 测试报告
+    "htmlcov/",
+    ".coverage",
+    ".coverage.*",
+
+    # 编辑器缓存
+    ".vscode/",
+    "**/*.swp",
+    "**/*.swo",
+    "**/*~",
+
+    # macOS
+    "**/.DS_Store",
+
+    # setuptools_scm 生成的文件
+    "xpyun_sdk/_version.py",
 
+    # 自动生成的文件
+    "**/.eggs/",
+]
+
+# POSIX 下用原生 rm 删除目录树，比 Python 层逐个递归快得多
+_RM_COMMAND = shutil.which("rm") if os.name == "posix" else None
+# 单次 rm 调用的最大路径数，避免超出命令行长度限制
+_RM_BATCH_SIZE = 256
+# 清理结果只保留前若干条用于展示，其余只计数
+_PREVIEW_SIZE = 10
+# 支持 dir_fd 时相对已打开的目录打开子目录、删除文件，免去内核逐级解析路径
+_HAS_DIR_FD = (
+    os.open in os.supports_dir_fd
+    and os.unlink in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+    and hasattr(os, "O_DIRECTORY")
+)
+if _HAS_DIR_FD:
+    _DIR_FLAGS = os.O_RDONLY | os.O_DIRECTORY | getattr(os, "O_NOFOLLOW", 0)
+
+
+def _split_patterns(patterns):
+    """
+    按作用范围拆分清理模式，以 / 结尾的模式只匹配目录
+
+    Returns:
+        (递归匹配规则, 仅根目录匹配规则, 固定相对路径列表)
+        匹配规则为 (文件适用规则, 目录适用规则)，可直接用 is_dir 下标取用；
+        固定路径为 (相对路径, 是否只匹配目录)
+    """
+    recursive, top_level, paths = ([], []), ([], []), []
     for pattern in patterns:
-        matches = glob.glob(pattern, recursive=True)
-        for match in matches:
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if pattern.startswith("**/"):
+            recursive[dir_only].append(pattern[3:])
+        elif "/" in pattern:
+            paths.append((pattern, dir_only))
+        else:
+            top_level[dir_only].append(pattern)
+    return _compile_rules(*recursive), _compile_rules(*top_level), paths
+
+
+def _compile_rules(patterns, dir_patterns):
+    """编译 (文件适用规则, 目录适用规则)，只匹配目录的模式不参与文件匹配"""
+    return _compile_rule(patterns), _compile_rule(patterns + dir_patterns)
+
+
+def _compile_rule(patterns):
+    """将文件名模式编译为 (精确名称集合, 后缀元组, 其余通配模式合并后的正则)"""
+    names, suffixes, wildcards = set(), [], []
+    for pattern in patterns:
+        if not any(c in pattern for c in "*?["):
+            names.add(pattern)
+        elif pattern.startswith("*") and not any(c in pattern[1:] for c in "*?["):
+            suffixes.append(pattern[1:])
+        elif pattern.startswith("."):
+            wildcards.append(fnmatch.translate(pattern))
+        else:
+            # 与glob一致，不以 . 开头的通配模式不匹配隐藏文件
+            wildcards.append(r"(?!\.)" + fnmatch.translate(pattern))
+    regex = None
+    if wildcards:
+        regex = re.compile("|".join(wildcards))
+    return frozenset(names), tuple(suffixes), regex
+
+
+def _matches(name, rule):
+    """判断文件名是否命中规则，后缀匹配同样跳过隐藏文件"""
+    names, suffixes, regex = rule
+    return (
+        name in names
+        or (not name.startswith(".") and name.endswith(suffixes))
+        or (regex is not None and regex.match(name) is not None)
+    )
+
+
+# 模块加载时一次性拆分并编译清理模式
+_RECURSIVE_RULE, _TOP_LEVEL_RULE, _FIXED_PATHS = _split_patterns(CLEAN_PATTERNS)
+
+
+def _open_dir(path, name=None, parent_fd=None):
+    """
+    打开目录用于遍历，提供parent_fd时相对父目录打开
+
+    Returns:
+        (目录fd, scandir迭代器)，不支持dir_fd时目录fd为None
+    """
+    if not _HAS_DIR_FD:
+        return None, os.scandir(path)
+    if parent_fd is None:
+        dir_fd = os.open(path, _DIR_FLAGS)
+    else:
+        dir_fd = os.open(name, _DIR_FLAGS, dir_fd=parent_fd)
+    try:
+        return dir_fd, os.scandir(dir_fd)
+    except OSError:
+        os.close(dir_fd)
+        raise
+
+
+def _close_dirs(stack):
+    """关闭遍历栈中剩余的目录迭代器和fd"""
+    while stack:
+        _, dir_fd, entries, _ = stack.pop()
+        entries.close()
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
+def _remove_file(path, name=None, dir_fd=None):
+    """删除单个文件，返回用于展示的描述，失败时返回None"""
+    try:
+        if dir_fd is None:
+            os.unlink(path)
+        else:
+            os.unlink(name, dir_fd=dir_fd)
+        return f"📄 {path}"
+    except OSError:
+        print(f"⚠️  跳过: {path}")
+        return None
+
+
+def _fast_rm(paths):
+    """
+    批量删除目录树
+
+    Returns:
+        删除失败的路径列表
+    """
+    remaining = paths
+    if _RM_COMMAND and paths:
+        remaining = []
+        for start in range(0, len(paths), _RM_BATCH_SIZE):
+            batch = paths[start:start + _RM_BATCH_SIZE]
+            result = subprocess.run(
+                [_RM_COMMAND, "-rf", "--", *batch],
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+            if result.returncode != 0:
+                remaining.extend(path for path in batch if os.path.lexists(path))
+
+    # rm 不可用或未能删除干净时回退到 shutil.rmtree
+    failed = []
+    for path in remaining:
+        try:
+            shutil.rmtree(path)
+        except OSError:
+            failed.append(path)
+    return failed
+
+
+def clean_directory(directory="."):
+    """
+    清理指定目录中的构建文件
+
+    Returns:
+        (已清理的项目数, 前若干条清理记录)
+    """
+
+    count = 0
+    preview = []
+    matched_dirs = []
+
+    def record(cleaned):
+        nonlocal count
+        count += 1
+        if len(preview) < _PREVIEW_SIZE:
+            preview.append(cleaned)
+
+    # 单次深度优先遍历目录树，每个条目同时与所有模式匹配
+    # 栈中每层为 (路径, 目录fd, scandir迭代器, 是否根目录)，同时打开的fd不超过目录深度
+    stack = []
+    try:
+        try:
+            stack.append((directory, *_open_dir(directory), True))
+        except OSError:
+            print(f"⚠️  跳过: {directory}")
+
+        while stack:
+            current, dir_fd, entries, at_top = stack[-1]
             try:
-                if os.path.isdir(match):
-                    shutil.rmtree(match)
-                    cleaned_files.append(f"📁 {match}")
+                entry = next(entries, None)
+            except OSError:
+                print(f"⚠️  跳过: {current}")
+                entry = None
+
+            if entry is None:
+                stack.pop()
+                entries.close()
+                if dir_fd is not None:
+                    os.close(dir_fd)
+                continue
+
+            name = entry.name
+            path = os.path.join(current, name)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+
+            if _matches(name, _RECURSIVE_RULE[is_dir]) or (
+                at_top and _matches(name, _TOP_LEVEL_RULE[is_dir])
+            ):
+                if is_dir:
+                    # 目录延后统一删除
+                    matched_dirs.append(path)
                 else:
-                    os.remove(match)
-                    cleaned_files.append(f"📄 {match}")
-            except (OSError, PermissionError):
-                print(f"⚠️  跳过: {match}")
+                    cleaned = _remove_file(path, name, dir_fd)
+                    if cleaned:
+                        record(cleaned)
+            elif is_dir and not name.startswith("."):
+                # 与glob的 ** 一致，不进入隐藏目录
+                try:
+                    stack.append((path, *_open_dir(path, name, dir_fd), False))
+                except OSError:
+                    print(f"⚠️  跳过: {path}")
+    finally:
+        # 异常退出时释放仍打开的目录
+        _close_dirs(stack)
+
+    # 固定路径直接定位，无需遍历
+    for relative_path, dir_only in _FIXED_PATHS:
+        path = os.path.join(directory, relative_path)
+        if dir_only:
+            # 只匹配目录的路径不按文件删除，也不跟随符号链接
+            if os.path.isdir(path) and not os.path.islink(path):
+                matched_dirs.append(path)
+            continue
+        # 先按文件直接删除，失败后再判断是否为目录，常见情况下省去一次stat
+        try:
+            os.unlink(path)
+            record(f"📄 {path}")
+        except FileNotFoundError:
+            pass
+        except IsADirectoryError:
+            matched_dirs.append(path)
+        except OSError:
+            # macOS/Windows 对目录unlink返回的是权限错误
+            if os.path.isdir(path):
+                matched_dirs.append(path)
+            else:
+                print(f"⚠️  跳过: {path}")
+
+    failed = set(_fast_rm(matched_dirs))
+    for path in matched_dirs:
+        if path in failed:
+            print(f"⚠️  跳过: {path}")
+        else:
+            record(f"📁 {path}")
 
-    return cleaned_files
+    return count, preview
 
 def clean_build():
     """执行完整的构建清理"""
     print("🧹 开始清理构建文件...")
 
     # 执行清理
-    cleaned_files = clean_directory()
+    count, preview = clean_directory()
 
-    if cleaned_files:
-        print(f"\n✅ 已清理 {len(cleaned_files)} 个项目:")
-        for file_info in cleaned_files[:10]:  # 只显示前10个
+    if count:
+        print(f"\n✅ 已清理 {count} 个项目:")
+        for file_info in preview:  # 只显示前10个
             print(f"   {file_info}")
 
-        if len(cleaned_files) > 10:
-            print(f"   ... 和另外 {len(cleaned_files) - 10} 个文件")
+        if count > len(preview):
+            print(f"   ... 和另外 {count - len(preview)} 个文件")
     else:
         print("✅ 无需清理，项目已很干净")
 
@@ -253,15 +253,31 @@ def advanced_usage():
             {"name": "分店2", "sn": "123456789013"}
         ]
 
-        for shop in shops:
-            try:
-                # 获取打印机状态
-                status = client.query_printer_status(shop["sn"])
-                print(f"{shop['name']} 状态: {status}")
-
-                # 打印订单（如果在线）
-                if status['data'].get('connected', False):
-                    test_content = f"""
+        # 并发查询所有店铺的打印机状态
+        statuses = client.gather(
+            "queryPrinterStatus",
+            [{"sn": shop["sn"]} for shop in shops],
+            return_exceptions=True
+        )
+
+        online_shops = []
+        for shop, status in zip(shops, statuses):
+            if isinstance(status, Exception):
+                print(f"{shop['name']} 操作失败: {status}")
+                continue
+
+            print(f"{shop['name']} 状态: {status}")
+
+            # 打印订单（如果在线）
+            if status['data'].get('connected', False):
+                online_shops.append(shop)
+            else:
+                print(f"{shop['name']} 打印机离线，跳過测试打印")
+
+        # 并发向在线店铺发送测试打印
+        print_tasks = []
+        for shop in online_shops:
+            test_content = f"""
 **{shop['name']} 测试订单**
 订单号: TEST{shop['sn']}
 时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -270,13 +286,14 @@ def advanced_usage():
 ----------------------
 **测试完成**
 """
-                    client.print_ticket(shop['sn'], test_content, times=1)
-                    print(f"{shop['name']} 测试打印已发送")
-                else:
-                    print(f"{shop['name']} 打印机离线，跳過测试打印")
+            print_tasks.append({"sn": shop['sn'], "content": test_content, "times": 1})
 
-            except Exception as e:
-                print(f"{shop['name']} 操作失败: {e}")
+        print_results = client.gather("print", print_tasks, return_exceptions=True)
+        for shop, result in zip(online_shops, print_results):
+            if isinstance(result, Exception):
+                print(f"{shop['name']} 操作失败: {result}")
+            else:
+                print(f"{shop['name']} 测试打印已发送")
 
     except Exception as e:
         print(f"高级示例执行失败: {e}")
@@ -314,6 +331,14 @@ def error_handling_example():
     except Exception as e:
         print(f"未知异常: {e}")
 
+# 示例编号到示例函数的映射
+EXAMPLES = {
+    "1": basic_usage,
+    "2": service_usage,
+    "3": advanced_usage,
+    "4": error_handling_example,
+}
+
 if __name__ == "__main__":
     from datetime import datetime
 
@@ -329,14 +354,9 @@ if __name__ == "__main__":
     else:
         example_num = "2"
 
-    if example_num == "1":
-        basic_usage()
-    elif example_num == "2":
-        service_usage()
-    elif example_num == "3":
-        advanced_usage()
-    elif example_num == "4":
-        error_handling_example()
+    example = EXAMPLES.get(example_num)
+    if example:
+        example()
     else:
         print(f"不存在的示例: {example_num}")
         print("请使用: python example.py [1|2|3|4]")
\ No newline at end of file
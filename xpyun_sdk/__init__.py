@@ -11,12 +11,41 @@ except ImportError:
 
 __author__ = "SDK开发者"
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .client import XpyunClient
 from .exceptions import XpyunError, XpyunAuthError, XpyunAPIError
-from .printer_manager import PrinterManager
-from .print_service import PrintService
-from .query_service import QueryService
-from .voice_service import VoiceService
+
+if TYPE_CHECKING:
+    from .printer_manager import PrinterManager
+    from .print_service import PrintService
+    from .query_service import QueryService
+    from .voice_service import VoiceService, VoiceType, PayType
+
+# 服务模块在首次访问时才导入，只用XpyunClient时无需加载
+_LAZY = {
+    "PrinterManager": ".printer_manager",
+    "PrintService": ".print_service",
+    "QueryService": ".query_service",
+    "VoiceService": ".voice_service",
+    "VoiceType": ".voice_service",
+    "PayType": ".voice_service",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 __all__ = [
     "XpyunClient",
@@ -26,5 +55,7 @@ __all__ = [
     "PrinterManager",
     "PrintService",
     "QueryService",
-    "VoiceService"
+    "VoiceService",
+    "VoiceType",
+    "PayType"
 ]
\ No newline at end of file
@@ -19,8 +19,23 @@ class XpyunAuth:
             user: 用户ID
             user_key: 用户密钥
         """
-        self.user = user
-        self.user_key = user_key
+        self._user = user
+        self._user_key = user_key
+        # user + UserKEY 前缀固定不变，预先吸收进哈希状态，签名时只需追加时间戳
+        # 签名算法由开放平台规定为SHA1；hashlib.sha1 在有OpenSSL时即直接使用其实现
+        self._base = hashlib.sha1(f"{user}{user_key}".encode('utf-8'))
+        # 最近一次的 (timestamp, sign)，同一秒内的请求签名相同可直接复用
+        self._last_sign = (None, None)
+
+    @property
+    def user(self) -> str:
+        """用户ID（只读，更换账号请创建新的认证对象）"""
+        return self._user
+
+    @property
+    def user_key(self) -> str:
+        """用户密钥（只读，签名前缀已据此预先计算）"""
+        return self._user_key
 
     def generate_sign(self, timestamp: Optional[str] = None) -> str:
         """
@@ -35,25 +50,36 @@ class XpyunAuth:
         if timestamp is None:
             timestamp = str(int(time.time()))
 
-        # 拼接字符串：user + UserKEY + timestamp
-        sign_str = f"{self.user}{self.user_key}{timestamp}"
+        # 整体读写元组，多线程下不会拿到不匹配的时间戳和签名
+        last_timestamp, last_sign = self._last_sign
+        if timestamp == last_timestamp:
+            return last_sign
+
+        # 签名内容：user + UserKEY + timestamp，复制预计算的前缀状态后追加时间戳
+        sha1_hash = self._base.copy()
+        sha1_hash.update(timestamp.encode('ascii'))
+        sign = sha1_hash.hexdigest()
 
-        # 计算SHA1哈希
-        sha1_hash = hashlib.sha1(sign_str.encode('utf-8'))
-        return sha1_hash.hexdigest().lower()
+        self._last_sign = (timestamp, sign)
+        return sign
 
-    def get_auth_params(self) -> Dict[str, str]:
+    def get_auth_params(self, timestamp: Optional[int] = None) -> Dict[str, str]:
         """
         获取认证参数
 
+        Args:
+            timestamp: 秒级时间戳，如果不提供则使用当前时间
+
         Returns:
             包含user、timestamp、sign的字典
         """
-        timestamp = str(int(time.time()))
+        if timestamp is None:
+            timestamp = int(time.time())
+        timestamp = str(timestamp)
         sign = self.generate_sign(timestamp)
 
         return {
-            'user': self.user,
+            'user': self._user,
             'timestamp': timestamp,
             'sign': sign
         }
@@ -5,18 +5,43 @@
 
 import json
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .auth import XpyunAuth
 from .exceptions import XpyunError, XpyunAuthError, XpyunAPIError, XpyunNetworkError
 
+try:
+    # orjson为可选依赖，安装后序列化/反序列化走C扩展
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """序列化为UTF-8编码的JSON字节串"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None).encode('utf-8')
+
+
+def _json_loads(raw: bytes) -> Any:
+    """解析JSON字节串，解析失败时抛出json.JSONDecodeError"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class XpyunClient:
     """芯烨云打印机客户端"""
 
     BASE_URL = "https://open.xpyun.net/api/openapi/xprinter"
     TIMEOUT = 30
+    POOL_SIZE = 32      # 连接池大小，批量/并发调用时复用keep-alive连接
+    MAX_RETRIES = 2     # 连接建立失败时的重试次数
 
     def __init__(self, user: str, user_key: str, debug: bool = False):
         """
@@ -32,8 +57,28 @@ class XpyunClient:
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json;charset=UTF-8',
-            'User-Agent': f'xpyun-sdk-python/0.1.0'
+            'User-Agent': f'xpyun-sdk-python/0.1.0',
+            'Connection': 'keep-alive'
         })
+        # POST不在Retry默认的allowed_methods中，请求发出后不会重试，避免重复提交打印任务
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_SIZE,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=Retry(total=self.MAX_RETRIES, backoff_factor=0.1)
+        )
+        self.session.mount("https://", adapter)
+
+    @property
+    def auth(self) -> XpyunAuth:
+        """认证对象"""
+        return self._auth
+
+    @auth.setter
+    def auth(self, auth: XpyunAuth) -> None:
+        # 请求热路径直接使用绑定好的用户ID和签名方法，替换认证对象时同步更新
+        self._auth = auth
+        self._user = auth.user
+        self._sign = auth.generate_sign
 
     def _make_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -49,30 +94,46 @@ class XpyunClient:
         Raises:
             XpyunError: API调用失败
         """
-        # 准备请求数据
-        request_data = self.auth.get_auth_params()
-        request_data['requestTime'] = int(time.time() * 1000)  # 毫秒时间戳
+        # 准备请求数据，签名时间戳与请求时间共用一次时钟读取
+        now_ns = time.time_ns()
+        timestamp = str(now_ns // 1_000_000_000)
+        request_data = {
+            'user': self._user,
+            'timestamp': timestamp,
+            'sign': self._sign(timestamp),
+            'requestTime': now_ns // 1_000_000  # 毫秒时间戳
+        }
 
         if params:
             request_data.update(params)
 
         try:
+            # 请求体只序列化一次，调试模式下直接发送并打印带缩进的版本
+            body = _json_dumps(request_data, pretty=self.debug)
+
             if self.debug:
-                print(f"请求数据: {json.dumps(request_data, ensure_ascii=False, indent=2)}")
+                print(f"请求数据: {body.decode('utf-8')}")
 
             # 发送POST请求
             response = self.session.post(
                 f"{self.BASE_URL}/{method}",
-                json=request_data,
+                data=body,
                 timeout=self.TIMEOUT
             )
-            response.raise_for_status()
-
-            # 解析响应
-            result = response.json()
+            raw = response.content
 
             if self.debug:
-                print(f"响应数据: {json.dumps(result, ensure_ascii=False, indent=2)}")
+                print(f"响应数据: {raw.decode('utf-8', errors='replace')}")
+
+            # 解析响应，以API返回的code为准，仅在响应体不是API结果时才按HTTP状态码报错
+            try:
+                result = _json_loads(raw)
+            except json.JSONDecodeError:
+                response.raise_for_status()
+                raise
+
+            if not response.ok and 'code' not in result:
+                response.raise_for_status()
 
             # 检查API返回状态
             if result.get('code') != 0:
@@ -93,6 +154,38 @@ class XpyunClient:
         except Exception as e:
             raise XpyunError(f"未知错误: {str(e)}")
 
+    def gather(self,
+               method: str,
+               params_list: List[Dict[str, Any]],
+               return_exceptions: bool = False) -> List[Any]:
+        """
+        并发发送多个API请求
+
+        各请求在线程池中执行，共享同一个连接池，结果按params_list的顺序返回
+
+        Args:
+            method: API方法名
+            params_list: 每个请求的参数列表
+            return_exceptions: 是否将失败请求的异常作为结果返回，否则直接抛出
+
+        Returns:
+            API响应数据列表
+        """
+        if not params_list:
+            return []
+
+        def request(params: Dict[str, Any]) -> Any:
+            try:
+                return self._make_request(method, params)
+            except XpyunError as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        max_workers = min(self.POOL_SIZE, len(params_list))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(request, params_list))
+
     def add_printers(self, printers: list) -> Dict[str, Any]:
         """
         添加打印机
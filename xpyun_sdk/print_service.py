@@ -3,22 +3,105 @@
 提供小票和标签打印功能
 """
 
-from typing import Dict, Any, Optional, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, Any, Optional, List, Tuple
 from .client import XpyunClient
 from .exceptions import XpyunError
 
 
+# 小票分隔线
+_SEP = "-" * 22
+
+# 小票头部：标题、订单信息和商品清单表头
+_RECEIPT_HEADER_TMPL = (
+    "**{title}**\n"
+    "{sep}\n"
+    "订单号: {order_no}\n"
+    "时间: {time}\n"
+    "桌号: {table_no}\n"
+    "\n"
+    "**商品清单**\n"
+    "{sep}"
+)
+
+# 小票统计信息
+_RECEIPT_TOTAL_TMPL = (
+    "{sep}\n"
+    "合计: {total_quantity}件  ￥{total_amount:.2f}\n"
+    "应付: ￥{payable:.2f}"
+)
+
+
+# 标签中单独排版的字段，其余字段按 "键: 值" 追加
+_LABEL_KNOWN_FIELDS = frozenset({
+    'product_name', 'barcode', 'price', 'spec', 'production_date', 'expiry_date'
+})
+
+# 商品行的标准字段，字段齐全时一次取出
+_ITEM_FIELDS = itemgetter('name', 'qty', 'price', 'amount')
+
+# 测试小票数据
+_TEST_RECEIPT_DATA = {
+    "title": "测试订单",
+    "order_no": "TEST001",
+    "time": "2024-01-01 12:00:00",
+    "table_no": "1号桌",
+    "items": [
+        {"name": "商品A", "qty": 2, "price": 10.00},
+        {"name": "商品B", "qty": 1, "price": 15.00},
+        {"name": "商品C", "qty": 3, "price": 8.00}
+    ],
+    "remark": "少放盐",
+    "footer": "谢谢惠顾！"
+}
+
+# 测试标签数据
+_TEST_LABEL_DATA = {
+    "product_name": "测试商品",
+    "barcode": "1234567890123",
+    "price": 25.80,
+    "spec": "500g/袋",
+    "production_date": "2024-01-01",
+    "expiry_date": "12个月"
+}
+
+
+class _SafeDict(dict):
+    """缺失的键格式化为空字符串"""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
 class PrintService:
     """打印服务"""
 
+    MAX_WORKERS = 16    # 批量打印的最大并发数
+    MAX_ASYNC_CONCURRENCY = 32  # 异步批量打印同时进行的最大请求数
+
+    # 测试小票/标签内容缓存，按实际类型区分，子类重写格式化方法时各自生成
+    _test_receipts: Dict[type, str] = {}
+    _test_labels: Dict[type, str] = {}
+
     def __init__(self, client: XpyunClient):
         """
         初始化打印服务
 
+        批量打印的各个工作线程共用client.session及其连接池，不会为每个任务新建连接，
+        因此并发数不会超过客户端连接池大小（XpyunClient.POOL_SIZE）
+
         Args:
             client: xpyun客户端实例
         """
         self.client = client
+        # 批量任务类型到打印方法的映射，按任务参数形态选取
+        self._task_handlers = {
+            "order": self.print_order,
+            "label": self.print_label,
+            "receipt": self.print_receipt,
+        }
 
     def print_receipt(self,
                      sn: str,
@@ -136,92 +219,186 @@ class PrintService:
         """
         批量打印
 
+        同一打印机的任务按列表顺序依次发送，不同打印机之间并发发送
+
         Args:
-            print_tasks: 打印任务列表，每个任务包含sn、content等参数
+            print_tasks: 打印任务列表，每个任务包含sn、content等参数；
+                         含order_data的按订单打印，含height的按标签打印，其余按小票打印
 
         Returns:
-            打印结果列表
+            打印结果列表，与任务顺序一致
         """
-        results = []
-        for task in print_tasks:
-            try:
-                if 'content' in task:
-                    # 小票打印
-                    result = self.print_receipt(**task)
-                elif 'order_data' in task:
-                    # 订单打印
-                    result = self.print_order(**task)
-                else:
-                    # 标签打印
-                    result = self.print_label(**task)
-
-                results.append({
-                    "success": True,
-                    "data": result,
-                    "task": task
-                })
-            except Exception as e:
-                results.append({
-                    "success": False,
-                    "error": str(e),
-                    "task": task
-                })
-
+        if not print_tasks:
+            return []
+
+        groups = self._group_by_printer(print_tasks)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(print_tasks)
+
+        # 每台打印机的任务在同一线程中顺序执行，保证出单顺序；不同打印机并发以重叠网络等待
+        # 线程数不超过客户端连接池大小，避免超出的连接在用完后被丢弃、下次重新握手
+        max_workers = min(self.MAX_WORKERS, self.client.POOL_SIZE, len(groups))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for indexed_results in executor.map(self._run_group, groups):
+                for index, result in indexed_results:
+                    results[index] = result
         return results
 
-    def _format_receipt_content(self, order_data: Dict[str, Any]) -> str:
+    async def batch_print_async(self,
+                                print_tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        格式化小票内容
+        异步批量打印，供asyncio应用在事件循环中调用而不阻塞
+
+        与batch_print一致，同一打印机的任务按列表顺序依次发送，不同打印机之间并发发送
 
         Args:
-            order_data: 订单数据
+            print_tasks: 打印任务列表，格式同batch_print
 
         Returns:
-            格式化后的小票内容
+            打印结果列表，与任务顺序一致
         """
-        # 基本信息
-        content = []
+        if not print_tasks:
+            return []
+
+        groups = self._group_by_printer(print_tasks)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(print_tasks)
+
+        # 每台打印机的任务作为一个整体提交到专用线程池，线程池大小即最大并发数
+        loop = asyncio.get_running_loop()
+        max_workers = min(self.MAX_ASYNC_CONCURRENCY, self.client.POOL_SIZE, len(groups))
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            grouped_results = await asyncio.gather(*(
+                loop.run_in_executor(executor, self._run_group, group) for group in groups
+            ))
+        finally:
+            # 不等待线程退出，避免阻塞事件循环；正常结束时所有任务均已完成
+            executor.shutdown(wait=False)
+
+        for indexed_results in grouped_results:
+            for index, result in indexed_results:
+                results[index] = result
+        return results
 
-        # 标题
-        content.append(f"**{order_data.get('title', '订单详情')}**")
-        content.append("----------------------")
+    @staticmethod
+    def _group_by_printer(print_tasks: List[Dict[str, Any]]) -> List[List[Tuple[int, Dict[str, Any]]]]:
+        """
+        按打印机编号分组，组内保持任务原有顺序
 
-        # 订单信息
-        content.append(f"订单号: {order_data.get('order_no', '')}")
-        content.append(f"时间: {order_data.get('time', '')}")
-        content.append(f"桌号: {order_data.get('table_no', '')}")
-        content.append("")
+        Args:
+            print_tasks: 打印任务列表
+
+        Returns:
+            分组列表，每组为 (任务下标, 任务) 列表，按打印机首次出现的顺序排列
+        """
+        groups: Dict[Any, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, task in enumerate(print_tasks):
+            groups.setdefault(task.get('sn'), []).append((index, task))
+        return list(groups.values())
 
-        # 商品列表
-        content.append("**商品清单**")
-        content.append("----------------------")
+    def _run_group(self,
+                   group: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        顺序执行同一打印机的一组任务
 
-        items = order_data.get('items', [])
-        for item in items:
-            name = item.get('name', '')
-            qty = item.get('qty', 0)
-            price = item.get('price', 0)
-            amount = item.get('amount', qty * price)
-            content.append(f"{name} x{qty}  {amount:.2f}")
+        Args:
+            group: (任务下标, 任务) 列表
 
-        content.append("----------------------")
+        Returns:
+            (任务下标, 打印结果) 列表
+        """
+        return [(index, self._run_task(task)) for index, task in group]
 
-        # 统计信息
-        total_quantity = sum(item.get('qty', 0) for item in items)
-        total_amount = sum(item.get('amount', item.get('qty', 0) * item.get('price', 0)) for item in items)
+    def _run_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        执行单个批量打印任务
 
-        content.append(f"合计: {total_quantity}件  ￥{total_amount:.2f}")
-        content.append(f"应付: ￥{order_data.get('total_amount', total_amount):.2f}")
+        Args:
+            task: 打印任务参数
 
-        # 备注
-        if order_data.get('remark'):
-            content.append("")
-            content.append(f"备注: {order_data.get('remark')}")
+        Returns:
+            打印结果，包含success、data或error以及原始任务
+        """
+        if 'order_data' in task:
+            tag = "order"
+        elif 'height' in task:
+            tag = "label"
+        else:
+            tag = "receipt"
+
+        try:
+            result = self._task_handlers[tag](**task)
+
+            return {
+                "success": True,
+                "data": result,
+                "task": task
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "task": task
+            }
 
-        content.append("")
-        content.append(order_data.get('footer', '谢谢惠顾，欢迎下次光临！'))
+    def _format_receipt_content(self, order_data: Dict[str, Any]) -> str:
+        """
+        格式化小票内容
 
-        return "\n".join(content)
+        Args:
+            order_data: 订单数据
+
+        Returns:
+            格式化后的小票内容
+        """
+        get = order_data.get
+        title = get('title', '订单详情')
+        items = get('items', [])
+        remark = get('remark')
+        footer = get('footer', '谢谢惠顾，欢迎下次光临！')
+
+        # 标题、订单信息和商品清单表头
+        header = _RECEIPT_HEADER_TMPL.format_map(_SafeDict(
+            order_data,
+            title=title,
+            sep=_SEP
+        ))
+
+        # 输出商品行的同时累计统计信息，只遍历一次商品列表
+        # 每个商品都要格式化一行文本，耗时主要在字符串处理上，合计在同一循环中顺带累加
+        item_lines = []
+        total_quantity = 0
+        total_amount = 0
+        for item in items:
+            try:
+                name, qty, price, amount = _ITEM_FIELDS(item)
+            except KeyError:
+                # 字段不全的商品逐个取值并使用默认值
+                item_get = item.get
+                name = item_get('name', '')
+                qty = item_get('qty', 0)
+                price = item_get('price', 0)
+                amount = item_get('amount')
+            if amount is None:
+                amount = qty * price
+            item_lines.append(f"{name} x{qty}  {amount:.2f}")
+            total_quantity += qty
+            total_amount += amount
+
+        # 统计信息、备注和页脚
+        footer_block = _RECEIPT_TOTAL_TMPL.format_map({
+            "sep": _SEP,
+            "total_quantity": total_quantity,
+            "total_amount": total_amount,
+            "payable": get('total_amount', total_amount)
+        })
+        if remark:
+            footer_block += f"\n\n备注: {remark}"
+        footer_block += f"\n\n{footer}"
+
+        # 头部、商品行、尾部三段拼接，没有商品时不留空行
+        if not item_lines:
+            return f"{header}\n{footer_block}"
+        return "\n".join((header, "\n".join(item_lines), footer_block))
 
     def _format_label_content(self, label_data: Dict[str, Any]) -> str:
         """
@@ -233,37 +410,46 @@ class PrintService:
         Returns:
             格式化后的标签内容
         """
+        get = label_data.get
+        product_name = get('product_name', '商品')
+        barcode = get('barcode')
+        price = get('price')
+        spec = get('spec')
+        production_date = get('production_date')
+        expiry_date = get('expiry_date')
+
         content = []
 
         # 商品名称
-        content.append(f"**{label_data.get('product_name', '商品') }**")
+        content.append(f"**{product_name}**")
         content.append("")
 
         # 条码
-        if label_data.get('barcode'):
-            content.append(f"条码: {label_data.get('barcode')}")
+        if barcode:
+            content.append(f"条码: {barcode}")
 
         # 价格
-        if label_data.get('price') is not None:
-            price = float(label_data.get('price'))
-            content.append(f"价格: ￥{price:.2f}")
+        if price is not None:
+            content.append(f"价格: ￥{float(price):.2f}")
 
         # 规格
-        if label_data.get('spec'):
-            content.append(f"规格: {label_data.get('spec')}")
+        if spec:
+            content.append(f"规格: {spec}")
 
         # 生产日期
-        if label_data.get('production_date'):
-            content.append(f"生产日期: {label_data.get('production_date')}")
+        if production_date:
+            content.append(f"生产日期: {production_date}")
 
         # 保质期
-        if label_data.get('expiry_date'):
-            content.append(f"保质期: {label_data.get('expiry_date')}")
+        if expiry_date:
+            content.append(f"保质期: {expiry_date}")
 
-        # 其他自定义字段
-        for key, value in label_data.items():
-            if key not in ['product_name', 'barcode', 'price', 'spec', 'production_date', 'expiry_date']:
-                content.append(f"{key}: {value}")
+        # 其他自定义字段：先用键视图做集合差判断是否存在，再按原顺序输出
+        extras = label_data.keys() - _LABEL_KNOWN_FIELDS
+        if extras:
+            content.extend(
+                f"{key}: {value}" for key, value in label_data.items() if key in extras
+            )
 
         return "\n".join(content)
 
@@ -274,20 +460,13 @@ class PrintService:
         Returns:
             测试小票内容字符串
         """
-        test_data = {
-            "title": "测试订单",
-            "order_no": "TEST001",
-            "time": "2024-01-01 12:00:00",
-            "table_no": "1号桌",
-            "items": [
-                {"name": "商品A", "qty": 2, "price": 10.00},
-                {"name": "商品B", "qty": 1, "price": 15.00},
-                {"name": "商品C", "qty": 3, "price": 8.00}
-            ],
-            "remark": "少放盐",
-            "footer": "谢谢惠顾！"
-        }
-        return self._format_receipt_content(test_data)
+        # 测试数据固定不变，首次生成后缓存
+        cls = type(self)
+        content = self._test_receipts.get(cls)
+        if content is None:
+            content = self._format_receipt_content(_TEST_RECEIPT_DATA)
+            self._test_receipts[cls] = content
+        return content
 
     def create_test_label(self) -> str:
         """
@@ -296,12 +475,9 @@ class PrintService:
         Returns:
             测试标签内容字符串
         """
-        test_data = {
-            "product_name": "测试商品",
-            "barcode": "1234567890123",
-            "price": 25.80,
-            "spec": "500g/袋",
-            "production_date": "2024-01-01",
-            "expiry_date": "12个月"
-        }
-        return self._format_label_content(test_data)
\ No newline at end of file
+        cls = type(self)
+        content = self._test_labels.get(cls)
+        if content is None:
+            content = self._format_label_content(_TEST_LABEL_DATA)
+            self._test_labels[cls] = content
+        return content
\ No newline at end of file
@@ -3,14 +3,43 @@
 提供打印机管理相关功能
 """
 
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional
 from .client import XpyunClient
 from .exceptions import XpyunError
 
 
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """按固定大小切分序列"""
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def _merge_data(first: Any, second: Any) -> Any:
+    """合并两个分批响应的data：列表拼接、数值累加、字典按键合并"""
+    if isinstance(first, list) and isinstance(second, list):
+        return first + second
+    if isinstance(first, dict) and isinstance(second, dict):
+        merged = dict(first)
+        for key, value in second.items():
+            merged[key] = _merge_data(merged[key], value) if key in merged else value
+        return merged
+    if (isinstance(first, (int, float)) and isinstance(second, (int, float))
+            and not isinstance(first, bool) and not isinstance(second, bool)):
+        return first + second
+    return first if first is not None else second
+
+
 class PrinterManager:
     """打印机管理器"""
 
+    CHUNK_SIZE = 100    # 批量添加/删除时单次请求的最大打印机数
+    MAX_WORKERS = 16    # 分批请求的最大并发数
+
     def __init__(self, client: XpyunClient):
         """
         初始化打印机管理器
@@ -49,7 +78,7 @@ class PrinterManager:
             printers: 打印机列表，每个打印机包含sn、name、card（可选）字段
 
         Returns:
-            API响应数据
+            API响应数据；超过CHUNK_SIZE时分批提交，失败批次的打印机编号列在data["fail"]中
 
         Example:
             printers = [
@@ -65,7 +94,7 @@ class PrinterManager:
             if not printer.get('sn') or not printer.get('name'):
                 raise XpyunError("每个打印机必须包含sn和name字段")
 
-        return self.client.add_printers(printers)
+        return self._call_chunked(self.client.add_printers, printers)
 
     def delete_printer(self, sn: str) -> Dict[str, Any]:
         """
@@ -87,12 +116,12 @@ class PrinterManager:
             sn_list: 打印机编号列表
 
         Returns:
-            API响应数据
+            API响应数据；超过CHUNK_SIZE时分批提交，失败批次的打印机编号列在data["fail"]中
         """
         if not sn_list:
             raise XpyunError("打印机编号列表不能为空")
 
-        return self.client.del_printers(sn_list)
+        return self._call_chunked(self.client.del_printers, sn_list)
 
     def update_printer_name(self, sn: str, name: str) -> Dict[str, Any]:
         """
@@ -181,6 +210,60 @@ class PrinterManager:
                 "queue_status": "unknown"
             }
 
+    def _call_chunked(self,
+                      api: Callable[[list], Dict[str, Any]],
+                      items: List[Any]) -> Dict[str, Any]:
+        """
+        按CHUNK_SIZE分批并发调用批量接口，并合并各批响应
+
+        Args:
+            api: 接收列表参数的客户端批量接口
+            items: 完整的参数列表
+
+        Returns:
+            合并后的API响应数据；部分批次失败时，已成功批次的结果照常合并，
+            失败批次的打印机编号追加到data["fail"]，错误信息追加到data["failMsg"]。
+            所有批次都失败时（没有任何打印机被处理）抛出第一个批次的异常
+        """
+        chunks = list(_chunked(items, self.CHUNK_SIZE))
+        if len(chunks) == 1:
+            return api(chunks[0])
+
+        def call(chunk: List[Any]) -> Any:
+            # 各批次独立收集结果或异常，避免一个批次失败时丢弃其他已生效批次的响应
+            try:
+                return api(chunk)
+            except XpyunError as e:
+                return e
+
+        max_workers = min(self.MAX_WORKERS, len(chunks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = list(executor.map(call, chunks))
+
+        responses = [o for o in outcomes if not isinstance(o, XpyunError)]
+        if not responses:
+            raise outcomes[0]
+
+        merged = dict(responses[0])
+        for response in responses[1:]:
+            merged["data"] = _merge_data(merged.get("data"), response.get("data"))
+
+        failed = [(chunk, o) for chunk, o in zip(chunks, outcomes) if isinstance(o, XpyunError)]
+        if failed:
+            data = merged.get("data")
+            data = dict(data) if isinstance(data, dict) else {}
+            fail = list(data.get("fail") or [])
+            fail_msg = list(data.get("failMsg") or [])
+            for chunk, error in failed:
+                for item in chunk:
+                    sn = item.get("sn") if isinstance(item, dict) else item
+                    fail.append(sn)
+                    fail_msg.append(f"{sn}:{error}")
+            data["fail"] = fail
+            data["failMsg"] = fail_msg
+            merged["data"] = data
+        return merged
+
     def _is_printer_online(self, status_data: Dict[str, Any]) -> bool:
         """
         判断打印机是否在线
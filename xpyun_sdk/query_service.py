@@ -3,11 +3,50 @@
 提供订单、统计、状态查询功能
 """
 
+import calendar
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from .client import XpyunClient
 from .exceptions import XpyunError
 
+# 最近一次格式化的 (秒级时间戳, 时间字符串)
+_last_now = (0, "")
+
+
+def _now_str() -> str:
+    """
+    获取当前时间字符串（%Y-%m-%d %H:%M:%S），同一秒内复用上次的格式化结果
+
+    Returns:
+        当前时间字符串
+    """
+    global _last_now
+    now_sec = int(time.time())
+    last_sec, last_str = _last_now
+    if now_sec == last_sec:
+        return last_str
+
+    now_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_sec))
+    _last_now = (now_sec, now_str)
+    return now_str
+
+
+# 各报告类型的摘要格式，参数依次为 (订单总数, 失败数, 成功率)
+_SUMMARY_FMT = {
+    "daily": lambda total, failed, rate: (
+        f"今日订单统计：共 {total} 单，成功 {total - failed} 单，成功率 {rate}%"
+    ),
+    "weekly": lambda total, failed, rate: (
+        f"本周订单统计：共 {total} 单，日均 {total / 7:.1f} 单，成功率 {rate}%"
+    ),
+    # 按 30 天近似计算日均
+    "monthly": lambda total, failed, rate: (
+        f"本月订单统计：共 {total} 单，日均 {total / 30:.1f} 单，成功率 {rate}%"
+    ),
+}
+
 
 class QueryService:
     """查询服务"""
@@ -21,12 +60,13 @@ class QueryService:
         """
         self.client = client
 
-    def get_order_status(self, order_id: str) -> Dict[str, Any]:
+    def get_order_status(self, order_id: str, include_raw: bool = False) -> Dict[str, Any]:
         """
         获取订单状态
 
         Args:
             order_id: 订单ID
+            include_raw: 是否在结果中附带API原始数据（raw_data），默认不附带
 
         Returns:
             订单状态信息
@@ -35,13 +75,14 @@ class QueryService:
             raise XpyunError("订单ID不能为空")
 
         result = self.client.query_order_state(order_id)
-        return self._parse_order_status(result)
+        return self._parse_order_status(result, include_raw)
 
     def get_order_statistics(self,
                            sn: str,
                            start_date: str = None,
                            end_date: str = None,
-                           days: int = 1) -> Dict[str, Any]:
+                           days: int = 1,
+                           include_raw: bool = False) -> Dict[str, Any]:
         """
         获取订单统计数据
 
@@ -50,6 +91,7 @@ class QueryService:
             start_date: 开始日期（YYYYMMDD格式），如果不提供则使用days参数
             end_date: 结束日期（YYYYMMDD格式），如果不提供则使用今天
             days: 统计天数（当start_date/end_date未提供时使用），默认1天
+            include_raw: 是否在结果中附带API原始数据（raw_data），默认不附带
 
         Returns:
             订单统计数据
@@ -59,21 +101,26 @@ class QueryService:
 
         if not start_date or not end_date:
             # 自动计算日期范围
-            end = datetime.now()
-            start = end - timedelta(days=days-1)
+            if days == 1:
+                # 最常见的当天统计，起止日期都是今天
+                start_date = end_date = time.strftime('%Y%m%d')
+            else:
+                end = datetime.now()
+                start = end - timedelta(days=days-1)
 
-            start_date = start.strftime('%Y%m%d')
-            end_date = end.strftime('%Y%m%d')
+                start_date = start.strftime('%Y%m%d')
+                end_date = end.strftime('%Y%m%d')
 
         result = self.client.query_order_statistics(sn, start_date, end_date)
-        return self._parse_statistics(result)
+        return self._parse_statistics(result, include_raw)
 
-    def get_printer_status(self, sn: str) -> Dict[str, Any]:
+    def get_printer_status(self, sn: str, include_raw: bool = False) -> Dict[str, Any]:
         """
         获取打印机状态
 
         Args:
             sn: 打印机编号
+            include_raw: 是否在结果中附带API原始数据（raw_data），默认不附带
 
         Returns:
             打印机状态信息
@@ -82,14 +129,15 @@ class QueryService:
             raise XpyunError("打印机编号不能为空")
 
         result = self.client.query_printer_status(sn)
-        return self._parse_printer_status(result)
+        return self._parse_printer_status(result, include_raw)
 
-    def get_printers_status(self, sn_list: List[str]) -> Dict[str, Any]:
+    def get_printers_status(self, sn_list: List[str], include_raw: bool = False) -> Dict[str, Any]:
         """
         批量获取打印机状态
 
         Args:
             sn_list: 打印机编号列表
+            include_raw: 是否在结果中附带API原始数据（raw_data），默认不附带
 
         Returns:
             批量状态信息
@@ -98,7 +146,7 @@ class QueryService:
             raise XpyunError("打印机编号列表不能为空")
 
         result = self.client.query_printers_status(sn_list)
-        return self._parse_printers_status(result)
+        return self._parse_printers_status(result, include_raw)
 
     def is_printer_online(self, sn: str) -> bool:
         """
@@ -126,14 +174,19 @@ class QueryService:
         if not sn:
             raise XpyunError("打印机编号不能为空")
 
-        # 获取状态信息
-        status = self.get_printer_status(sn)
+        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
 
-        # 获取今日统计数据
-        today_stats = self.get_order_statistics(sn, days=1)
+        # 状态、今日统计、昨日统计三个查询相互独立，并发发送
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            status_future = executor.submit(self.get_printer_status, sn)
+            today_future = executor.submit(self.get_order_statistics, sn, days=1)
+            yesterday_future = executor.submit(
+                self.get_order_statistics, sn, yesterday, yesterday
+            )
 
-        # 获取昨日统计数据
-        yesterday_stats = self.get_order_statistics(sn, days=1)
+            status = status_future.result()
+            today_stats = today_future.result()
+            yesterday_stats = yesterday_future.result()
 
         return {
             "sn": sn,
@@ -141,7 +194,7 @@ class QueryService:
             "today_stats": today_stats,
             "yesterday_stats": yesterday_stats,
             "is_online": status.get('is_online', False),
-            "last_update": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            "last_update": _now_str()
         }
 
     def get_system_status(self) -> Dict[str, Any]:
@@ -154,7 +207,7 @@ class QueryService:
         # 获取所有打印机状态作为系统状态
         # 注意：这里需要您提供一个打印机编号列表，或者使用已添加的打印机
         return {
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "timestamp": _now_str(),
             "status": "normal"  # 需要根据实际情况判断
         }
 
@@ -179,42 +232,50 @@ class QueryService:
         # 如果API不支持，可以返回空列表或抛出异常
         raise NotImplementedError("订单搜索功能需要云平台API支持")
 
-    def _parse_order_status(self, api_response: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_order_status(self,
+                            api_response: Dict[str, Any],
+                            include_raw: bool = False) -> Dict[str, Any]:
         """
         解析订单状态响应
 
         Args:
             api_response: API原始响应
+            include_raw: 是否附带API原始数据（raw_data）
 
         Returns:
             解析后的订单状态
         """
         data = api_response.get("data", {})
 
-        return {
+        parsed = {
             "order_id": data.get("orderId"),
             "status": data.get("state"),
             "print_status": data.get("printStatus"),
             "print_time": data.get("printTime"),
             "printer_sn": data.get("sn"),
             "is_completed": data.get("state") == "completed",
-            "is_failed": data.get("state") == "failed",
-            "raw_data": data
+            "is_failed": data.get("state") == "failed"
         }
+        if include_raw:
+            parsed["raw_data"] = data
+        return parsed
 
-    def _parse_statistics(self, api_response: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_statistics(self,
+                          api_response: Dict[str, Any],
+                          include_raw: bool = False) -> Dict[str, Any]:
         """
         解析统计数据响应
 
         Args:
             api_response: API原始响应
+            include_raw: 是否附带API原始数据（raw_data）
 
         Returns:
             解析后的统计数据
         """
         data = api_response.get("data", {})
 
-        return {
+        parsed = {
             "print_orders": data.get("printCount", 0),
             "failed_orders": data.get("failedCount", 0),
             "success_rate": self._calculate_success_rate(
@@ -224,60 +285,77 @@ class QueryService:
             "date_range": {
                 "start": data.get("dateFrom"),
                 "end": data.get("dateTo")
-            },
-            "raw_data": data
+            }
         }
+        if include_raw:
+            parsed["raw_data"] = data
+        return parsed
 
-    def _parse_printer_status(self, api_response: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_printer_status(self,
+                              api_response: Dict[str, Any],
+                              include_raw: bool = False) -> Dict[str, Any]:
         """
         解析打印机状态响应
 
         Args:
             api_response: API原始响应
+            include_raw: 是否附带API原始数据（raw_data）
 
         Returns:
             解析后的状态信息
         """
         data = api_response.get("data", {})
 
-        return {
+        parsed = {
             "sn": data.get("sn"),
             "is_online": data.get("connected", False),
             "has_paper": data.get("hasPaper", False),
             "temperature": data.get("temperature"),
             "voltage": data.get("voltage"),
             "queue_length": data.get("queueLength", 0),
-            "last_update": data.get("lastUpdateTime"),
-            "raw_data": data
+            "last_update": data.get("lastUpdateTime")
         }
+        if include_raw:
+            parsed["raw_data"] = data
+        return parsed
 
-    def _parse_printers_status(self, api_response: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_printers_status(self,
+                               api_response: Dict[str, Any],
+                               include_raw: bool = False) -> Dict[str, Any]:
         """
         解析批量打印机状态响应
 
         Args:
             api_response: API原始响应
+            include_raw: 是否附带API原始数据（raw_data）
 
         Returns:
             解析后的状态信息
         """
         data = api_response.get("data", {})
         printers = []
+        online_count = 0
 
         # 假设返回格式是字典，键是SN，值是状态信息
         for sn, status in data.items():
-            printers.append({
+            is_online = status.get("connected", False)
+            if is_online:
+                online_count += 1
+            printer = {
                 "sn": sn,
-                "is_online": status.get("connected", False),
+                "is_online": is_online,
                 "has_paper": status.get("hasPaper", False),
-                "queue_length": status.get("queueLength", 0),
-                "raw_data": status
-            })
+                "queue_length": status.get("queueLength", 0)
+            }
+            if include_raw:
+                printer["raw_data"] = status
+            printers.append(printer)
 
+        total = len(printers)
         return {
-            "total": len(printers),
-            "online_count": sum(1 for p in printers if p["is_online"]),
-            "offline_count": sum(1 for p in printers if not p["is_online"]),
+            "total": total,
+            "online_count": online_count,
+            "offline_count": total - online_count,
             "printers": printers
         }
 
@@ -316,7 +394,7 @@ class QueryService:
             raise XpyunError("打印机编号不能为空")
 
         if date is None:
-            date = datetime.now().strftime('%Y%m%d')
+            date = time.strftime('%Y%m%d')
 
         # 根据报告类型计算日期范围
         if report_type == "daily":
@@ -328,15 +406,12 @@ class QueryService:
             start_date = start.strftime('%Y%m%d')
             end_date = end.strftime('%Y%m%d')
         elif report_type == "monthly":
-            current = datetime.strptime(date[:6] + '01', '%Y%m%d')
-            start_date = current.strftime('%Y%m%d')
+            year, month = int(date[:4]), int(date[4:6])
+            start_date = f"{year}{month:02d}01"
 
-            # 获取下个月的第一天，然后减去一天
-            if current.month == 12:
-                next_month = current.replace(year=current.year + 1, month=1)
-            else:
-                next_month = current.replace(month=current.month + 1)
-            end_date = (next_month - timedelta(days=1)).strftime('%Y%m%d')
+            # 当月最后一天
+            last_day = calendar.monthrange(year, month)[1]
+            end_date = f"{year}{month:02d}{last_day:02d}"
         else:
             raise XpyunError(f"不支持的报告类型: {report_type}")
 
@@ -368,16 +443,10 @@ class QueryService:
         failed_orders = statistics.get("failed_orders", 0)
         success_rate = statistics.get("success_rate", 0)
 
-        if report_type == "daily":
-            return f"今日订单统计：共 {total_orders} 单，成功 {total_orders - failed_orders} 单，成功率 {success_rate}%"
-        elif report_type == "weekly":
-            avg_orders = total_orders / 7
-            return f"本周订单统计：共 {total_orders} 单，日均 {avg_orders:.1f} 单，成功率 {success_rate}%"
-        elif report_type == "monthly":
-            avg_orders = total_orders / 30  # 近似计算
-            return f"本月订单统计：共 {total_orders} 单，日均 {avg_orders:.1f} 单，成功率 {success_rate}%"
-        else:
+        fmt = _SUMMARY_FMT.get(report_type)
+        if fmt is None:
             return ""
+        return fmt(total_orders, failed_orders, success_rate)
 
     def format_duration(self, seconds: int) -> str:
         """
@@ -411,5 +480,4 @@ class QueryService:
         Returns:
             True表示在营业时间内
         """
-        now = datetime.now()
-        return hours_start <= now.hour < hours_end
\ No newline at end of file
+        return hours_start <= time.localtime().tm_hour < hours_end
\ No newline at end of file
@@ -3,49 +3,226 @@
 提供语音播报相关功能
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import asyncio
+import functools
+import logging
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from types import MappingProxyType
 from .client import XpyunClient
 from .exceptions import XpyunError
+from .print_service import PrintService
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceType(IntEnum):
+    """语音类型"""
+
+    MANDARIN_FEMALE = 0     # 中文女声
+    MANDARIN_MALE = 1       # 中文男声
+    CANTONESE_FEMALE = 2    # 粤语女声
+    ENGLISH_FEMALE = 3      # 英文女声
+    CANTONESE_MALE = 4      # 粤语男声
+    ENGLISH_MALE = 5        # 英文男声
+
+
+class PayType(IntEnum):
+    """支付类型"""
+
+    CASH = 1                # 现金支付
+    CARD = 2                # 银行卡支付
+    QR_CODE = 3             # 扫码支付
+    OTHER = 0               # 其他支付
+
+
+# 语音类型定义（只读，名称 -> 编号）
+VOICE_TYPES = MappingProxyType({member.name: member.value for member in VoiceType})
+
+# 支付类型定义（只读，名称 -> 编号）
+PAY_TYPES = MappingProxyType({member.name: member.value for member in PayType})
+
+# 语音类型名称，按编号索引（编号从0开始连续）
+_VOICE_NAMES = tuple(member.name for member in sorted(VoiceType, key=int))
+
+# 名称查找表，同时收录大写和小写写法，常见写法无需先调用upper()
+_VOICE_LOOKUP = {**VOICE_TYPES, **{k.lower(): v for k, v in VOICE_TYPES.items()}}
+_PAY_LOOKUP = {**PAY_TYPES, **{k.lower(): v for k, v in PAY_TYPES.items()}}
+
+# play_voice常见支付参数到提交值的映射（含未指定支付类型的None），命中时无需再做转换
+_PAY_ARGS = {None: None, **_PAY_LOOKUP}
+
+# 业务语音事件
+_VOICE_EVENTS = ("NEW_ORDER", "COMPLETE_ORDER", "ERROR", "NO_PAPER", "LOW_BATTERY")
+
+# 业务语音快捷方法使用的发音人前缀
+_VOICE_SPEAKERS = (
+    "FEMALE", "MALE",
+    "CANTONESE_FEMALE", "CANTONESE_MALE",
+    "ENGLISH_FEMALE", "ENGLISH_MALE",
+)
+
+# 预先拼好的语音标识，键为 (前缀, 后缀)，值为驻留后的 "前缀_后缀"
+_VOICE_TAGS = {
+    (prefix, suffix): sys.intern(f"{prefix}_{suffix}")
+    for prefix, suffixes in (
+        *((speaker, _VOICE_EVENTS) for speaker in _VOICE_SPEAKERS),
+        ("WELCOME", VOICE_TYPES),
+        ("TEST", VOICE_TYPES),
+        ("AMOUNT", PAY_TYPES),
+    )
+    for suffix in suffixes
+}
+
+
+def _voice_tag(prefix: str, suffix: str) -> str:
+    """
+    获取语音标识 "前缀_后缀"，常用组合直接取预先拼好的字符串
+
+    Args:
+        prefix: 前缀
+        suffix: 后缀
+
+    Returns:
+        语音标识
+    """
+    try:
+        return _VOICE_TAGS[prefix, suffix]
+    except KeyError:
+        return f"{prefix}_{suffix}"
+
+
+# 支付类型编号 -> 收款语音标识（AMOUNT_*），预先生成
+_AMOUNT_TAGS = {member.value: _voice_tag("AMOUNT", member.name) for member in PayType}
+
+
+def _amount_voice_tag(pay_type: int) -> str:
+    """
+    获取收款语音标识
+
+    Args:
+        pay_type: 支付类型编号（已转换）
+
+    Returns:
+        收款语音标识，例如 3 -> "AMOUNT_QR_CODE"
+    """
+    try:
+        return _AMOUNT_TAGS[pay_type]
+    except KeyError:
+        raise XpyunError(f"不支持的支付类型: {pay_type}") from None
+
+
+def name_for_voice_type(voice_type: int) -> Optional[str]:
+    """
+    根据语音类型编号获取名称
+
+    Args:
+        voice_type: 语音类型编号
+
+    Returns:
+        语音类型名称，例如 2 -> "CANTONESE_FEMALE"，未知编号返回None
+    """
+    try:
+        # 负数下标会从末尾取值，需排除
+        return _VOICE_NAMES[voice_type] if voice_type >= 0 else None
+    except (IndexError, TypeError):
+        return None
+
+
+def _resolve_type(table: Dict[str, int], value: Any, kind: str) -> int:
+    """
+    将类型名称或编号转换为编号，先按原写法查找，未命中时再按大写查找，
+    非字符串（整数、枚举）转为整数，无法识别的值抛出XpyunError
+
+    Args:
+        table: 名称查找表
+        value: 类型名称或编号
+        kind: 类型描述，用于错误信息
+
+    Returns:
+        类型编号
+    """
+    try:
+        return table[value]
+    except (KeyError, TypeError):
+        pass
+    try:
+        return table[value.upper()]
+    except AttributeError:
+        pass
+    except KeyError:
+        raise XpyunError(f"不支持的{kind}: {value}") from None
+
+    # 非字符串（整数、枚举等）按编号处理，无法转换或带小数的值不做截断，直接报错
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise XpyunError(f"不支持的{kind}: {value}") from None
+    if number != value:
+        raise XpyunError(f"不支持的{kind}: {value}")
+    return number
 
 
 class VoiceService:
     """语音服务"""
 
-    # 语音类型定义
-    VOICE_TYPES = {
-        "MANDARIN_FEMALE": 0,      # 中文女声
-        "MANDARIN_MALE": 1,        # 中文男声
-        "CANTONESE_FEMALE": 2,     # 粤语女声
-        "ENGLISH_FEMALE": 3,       # 英文女声
-        "CANTONESE_MALE": 4,       # 粤语男声
-        "ENGLISH_MALE": 5,         # 英文男声
-    }
+    VOICE_TYPES = VOICE_TYPES
+    PAY_TYPES = PAY_TYPES
 
-    # 支付类型定义
-    PAY_TYPES = {
-        "CASH": 1,                  # 现金支付
-        "CARD": 2,                  # 银行卡支付
-        "QR_CODE": 3,               # 扫码支付
-        "OTHER": 0,                 # 其他支付
+    # 支持的语音类型名称（不可变，可直接返回给调用方）
+    SUPPORTED_VOICES: Tuple[str, ...] = tuple(VOICE_TYPES)
+
+    # get_voice_settings返回结果的模板，每次复制后填入查询值，键的顺序保持一致
+    _SETTINGS_TEMPLATE = {
+        "is_voice_enabled": False,
+        "current_voice_type": 0,
+        "current_voice_name": None,
+        "voice_quality": "normal",
+        "last_voice_update": None,
+        "supported_voices": SUPPORTED_VOICES,
     }
 
-    def __init__(self, client: XpyunClient):
+    name_for_voice_type = staticmethod(name_for_voice_type)
+
+    MAX_WORKERS = 32    # 批量播报的最大并发数
+    SETTINGS_TTL = 30   # 语音设置缓存有效期（秒）
+    SETTINGS_CACHE_SIZE = 256   # 语音设置最多缓存的打印机数量
+
+    def __init__(self, client: XpyunClient, print_service: Optional[PrintService] = None):
         """
         初始化语音服务
 
         Args:
             client: xpyun客户端实例
+            print_service: 打印服务实例（可选），不提供时在首次打印时使用同一客户端创建
         """
         self.client = client
+        self._print_service = print_service
+        # 语音设置缓存：sn -> (过期时间, 语音设置)
+        self._settings_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # 最近一次成功设置的语音状态：sn -> ((语音类型, 是否启用), API响应)
+        self._voice_state: Dict[str, Tuple[Tuple[int, bool], Dict[str, Any]]] = {}
+
+    @property
+    def print_service(self) -> PrintService:
+        """打印服务实例，首次使用时创建，与语音请求共用同一客户端和连接池"""
+        if self._print_service is None:
+            self._print_service = PrintService(self.client)
+        return self._print_service
 
     def set_voice_type(self, sn: str, voice_type: int or str, voice_enabled: bool = True) -> Dict[str, Any]:
         """
         设置语音类型
 
+        与最近一次成功设置的状态相同时不再请求云平台，直接返回上次的响应；
+        打印机设置可能在别处被修改时，先调用invalidate清除记录
+
         Args:
             sn: 打印机编号
-            voice_type: 语音类型（数字或预设字符串）
+            voice_type: 语音类型（VoiceType、数字或预设字符串）
             voice_enabled: 是否启用语音播报
 
         Returns:
@@ -54,15 +231,33 @@ class VoiceService:
         if not sn:
             raise XpyunError("打印机编号不能为空")
 
-        # 转换语音类型
-        if isinstance(voice_type, str):
-            voice_type_int = self.VOICE_TYPES.get(voice_type.upper())
-            if voice_type_int is None:
-                raise XpyunError(f"不支持的语音类型: {voice_type}")
-        else:
-            voice_type_int = voice_type
+        # 转换语音类型，VoiceType等整数统一转为普通整数再提交
+        voice_type_int = _resolve_type(_VOICE_LOOKUP, voice_type, "语音类型")
+        state = (voice_type_int, bool(voice_enabled))
+
+        last = self._voice_state.get(sn)
+        if last is not None and last[0] == state:
+            return last[1]
 
-        return self.client.set_voice_type(sn, voice_type_int, 1 if voice_enabled else 0)
+        result = self.client.set_voice_type(sn, voice_type_int, 1 if voice_enabled else 0)
+        self._voice_state[sn] = (state, result)
+        # 设置已变更，缓存的语音设置不再可信
+        self._settings_cache.pop(sn, None)
+        return result
+
+    def invalidate(self, sn: Optional[str] = None) -> None:
+        """
+        清除本地记录的语音状态和语音设置缓存，下次调用会重新请求云平台
+
+        Args:
+            sn: 打印机编号，不提供时清除全部打印机的记录
+        """
+        if sn is None:
+            self._voice_state.clear()
+            self._settings_cache.clear()
+        else:
+            self._voice_state.pop(sn, None)
+            self._settings_cache.pop(sn, None)
 
     def play_voice(self, sn: str, voice_type: str, pay_type: int or str = None) -> Dict[str, Any]:
         """
@@ -79,36 +274,69 @@ class VoiceService:
         if not sn or not voice_type:
             raise XpyunError("打印机编号和语音类型不能为空")
 
-        # 转换支付类型
-        if pay_type is not None:
-            if isinstance(pay_type, str):
-                pay_type_int = self.PAY_TYPES.get(pay_type.upper())
-                if pay_type_int is None:
-                    raise XpyunError(f"不支持的支付类型: {pay_type}")
-            else:
-                pay_type_int = pay_type
-        else:
-            pay_type_int = None
+        # 转换支付类型，常见写法直接查表，其余（整数、枚举、大小写混写）走通用转换
+        try:
+            pay_type_int = _PAY_ARGS[pay_type]
+        except (KeyError, TypeError):
+            pay_type_int = _resolve_type(_PAY_LOOKUP, pay_type, "支付类型")
 
         return self.client.play_voice(sn, voice_type, pay_type_int)
 
-    def play_amount_voice(self, sn: str, amount: float, pay_type: str = "CASH") -> Dict[str, Any]:
+    def play_voice_bulk(self, sn_list: List[str], voice_type: str,
+                        pay_type: int or str = None) -> List[Dict[str, Any]]:
+        """
+        向多台打印机播放同一条语音
+
+        各请求在线程池中并发发送，共享客户端的连接池
+
+        Args:
+            sn_list: 打印机编号列表
+            voice_type: 语音类型（字符串）
+            pay_type: 支付类型（可选）
+
+        Returns:
+            播放结果列表，与sn_list顺序一致，每项包含sn、success以及data或error
+        """
+        if not voice_type:
+            raise XpyunError("语音类型不能为空")
+        if not sn_list:
+            return []
+
+        def play(sn: str) -> Dict[str, Any]:
+            try:
+                return {
+                    "sn": sn,
+                    "success": True,
+                    "data": self.play_voice(sn, voice_type, pay_type)
+                }
+            except Exception as e:
+                return {
+                    "sn": sn,
+                    "success": False,
+                    "error": str(e)
+                }
+
+        max_workers = min(self.MAX_WORKERS, self.client.POOL_SIZE, len(sn_list))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(play, sn_list))
+
+    def play_amount_voice(self, sn: str, amount: float, pay_type: int or str = "CASH") -> Dict[str, Any]:
         """
         播放收款金额语音
 
         Args:
             sn: 打印机编号
             amount: 金额
-            pay_type: 支付类型
+            pay_type: 支付类型（PayType、数字或预设字符串）
 
         Returns:
             API响应数据
         """
-        # 格式化金额语音
-        amount_str = self._format_amount_voice(amount)
-        voice_type = f"AMOUNT_{pay_type.upper()}"
+        # 先统一转换支付类型，再按名称生成收款语音标识
+        pay_type_int = _resolve_type(_PAY_LOOKUP, pay_type, "支付类型")
+        voice_type = _amount_voice_tag(pay_type_int)
 
-        return self.play_voice(sn, voice_type, pay_type)
+        return self.play_voice(sn, voice_type, pay_type_int)
 
     def play_welcome_message(self, sn: str, voice_type: str = "MANDARIN_FEMALE") -> Dict[str, Any]:
         """
@@ -121,7 +349,7 @@ class VoiceService:
         Returns:
             API响应数据
         """
-        return self.play_voice(sn, f"WELCOME_{voice_type}")
+        return self.play_voice(sn, _voice_tag("WELCOME", voice_type))
 
     def print_and_voice(self, sn: str, content: str, amount: float = None,
                        voice_enabled: bool = True, pay_type: str = "CASH") -> Dict[str, Any]:
@@ -138,12 +366,8 @@ class VoiceService:
         Returns:
             打印结果
         """
-        from .print_service import PrintService
-
-        print_service = PrintService(self.client)
-
         # 执行打印
-        print_result = print_service.print_receipt(
+        print_result = self.print_service.print_receipt(
             sn=sn,
             content=content,
             voice_enabled=voice_enabled
@@ -154,17 +378,19 @@ class VoiceService:
             try:
                 self.play_amount_voice(sn, amount, pay_type)
             except Exception as e:
-                print(f"语音播报失败: {e}")
+                logger.exception("语音播报失败: %s", e)
 
         return print_result
 
-    def voice_auto_order(self, sn: str, order_data: Dict[str, Any]) -> Dict[str, Any]:
+    def voice_auto_order(self, sn: str, order_data: Dict[str, Any],
+                         order_delay: float = 1.0) -> Dict[str, Any]:
         """
         根据订单数据自动生成语音播报
 
         Args:
             sn: 打印机编号
             order_data: 订单数据
+            order_delay: 金额语音发出后到新订单语音的间隔（秒），传0表示不等待
 
         Returns:
             API响应数据
@@ -172,21 +398,184 @@ class VoiceService:
         amount = order_data.get('total_amount')
         pay_type = order_data.get('pay_type', 'CASH')
 
+        voices = []
         # 如果有金额，先播报收款语音
         if amount is not None:
             try:
-                self.play_amount_voice(sn, amount, pay_type)
-                time.sleep(1)  # 暂停1秒
+                pay_type_int = _resolve_type(_PAY_LOOKUP, pay_type, "支付类型")
+                voices.append((_amount_voice_tag(pay_type_int), pay_type_int))
+            except Exception as e:
+                logger.exception("金额语音播报失败: %s", e)
+
+        # 再播报订单内容（如果有新订单语音）
+        voices.append("NEW_ORDER")
+
+        result = self.play_voice_sequence(sn, voices, order_delay)[-1]
+        return result["data"] if result["success"] else None
+
+    def play_voice_sequence(self, sn: str, voices: List[Any],
+                            interval: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        按顺序播放多条语音
+
+        云平台没有一次提交多条语音的接口，这里在客户端依次发送，各请求复用客户端的keep-alive连接；
+        间隔从上一条语音发出时算起，请求耗时计入间隔内，上一条播报失败时不再等待
+
+        Args:
+            sn: 打印机编号
+            voices: 语音列表，每项为语音类型字符串或 (语音类型, 支付类型) 元组
+            interval: 相邻两条语音的间隔（秒），传0表示不等待
+
+        Returns:
+            播放结果列表，与voices顺序一致，每项包含voice_type、success以及data或error
+        """
+        results = []
+        next_at = None
+        for voice in voices:
+            voice_type, pay_type = voice if isinstance(voice, tuple) else (voice, None)
+
+            if next_at is not None:
+                remaining = next_at - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+
+            started = time.monotonic()
+            try:
+                data = self.play_voice(sn, voice_type, pay_type)
             except Exception as e:
-                print(f"金额语音播报失败: {e}")
+                logger.exception("语音 %s 播报失败: %s", voice_type, e)
+                results.append({
+                    "voice_type": voice_type,
+                    "success": False,
+                    "error": str(e)
+                })
+                next_at = None
+            else:
+                results.append({
+                    "voice_type": voice_type,
+                    "success": True,
+                    "data": data
+                })
+                next_at = started + interval
 
-        # 播报订单内容（如果有新订单语音）
+        return results
+
+    async def play_voice_async(self, sn: str, voice_type: str, pay_type: int or str = None) -> Dict[str, Any]:
+        """
+        异步播放语音，供asyncio应用在事件循环中调用而不阻塞
+
+        Args:
+            sn: 打印机编号
+            voice_type: 语音类型（字符串）
+            pay_type: 支付类型（可选）
+
+        Returns:
+            API响应数据
+        """
+        return await self._run_in_executor(self.play_voice, sn, voice_type, pay_type)
+
+    async def play_amount_voice_async(self, sn: str, amount: float,
+                                      pay_type: int or str = "CASH") -> Dict[str, Any]:
+        """
+        异步播放收款金额语音
+
+        Args:
+            sn: 打印机编号
+            amount: 金额
+            pay_type: 支付类型
+
+        Returns:
+            API响应数据
+        """
+        return await self._run_in_executor(self.play_amount_voice, sn, amount, pay_type)
+
+    async def print_and_voice_async(self, sn: str, content: str, amount: float = None,
+                                    voice_enabled: bool = True, pay_type: str = "CASH") -> Dict[str, Any]:
+        """
+        异步打印并播报，与print_and_voice一致：打印成功后才播报金额，打印失败时直接抛出异常
+
+        Args:
+            sn: 打印机编号
+            content: 打印内容
+            amount: 金额（如果有）
+            voice_enabled: 是否启用语音播报
+            pay_type: 支付类型
+
+        Returns:
+            打印结果
+        """
+        # 执行打印，失败时向调用方抛出异常，不再播报
+        print_result = await self._run_in_executor(
+            self.print_service.print_receipt,
+            sn=sn,
+            content=content,
+            voice_enabled=voice_enabled
+        )
+
+        # 如果需要播报金额
+        if voice_enabled and amount is not None:
+            try:
+                await self.play_amount_voice_async(sn, amount, pay_type)
+            except Exception as e:
+                logger.exception("语音播报失败: %s", e)
+
+        return print_result
+
+    async def voice_auto_order_async(self, sn: str, order_data: Dict[str, Any],
+                                     order_delay: float = 1.0) -> Dict[str, Any]:
+        """
+        异步根据订单数据自动生成语音播报
+
+        与voice_auto_order时序一致：金额语音返回后才发出新订单语音，间隔从金额语音发出时算起，
+        请求耗时计入间隔内，只补足剩余时间；金额语音播报失败时不再等待。
+        等待期间不占用线程，取消任务会立即结束，不再发出新订单语音
+
+        Args:
+            sn: 打印机编号
+            order_data: 订单数据
+            order_delay: 金额语音发出后到新订单语音的间隔（秒），传0表示不等待
+
+        Returns:
+            新订单语音的API响应数据，播报失败时返回None
+        """
+        amount = order_data.get('total_amount')
+        pay_type = order_data.get('pay_type', 'CASH')
+
+        # 如果有金额，先播报收款语音
+        if amount is not None:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                await self.play_amount_voice_async(sn, amount, pay_type)
+            except Exception as e:
+                logger.exception("金额语音播报失败: %s", e)
+            else:
+                remaining = order_delay - (loop.time() - started)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+        # 再播报订单内容（如果有新订单语音）
         try:
-            return self.play_voice(sn, "NEW_ORDER")
+            return await self.play_voice_async(sn, "NEW_ORDER")
         except Exception as e:
-            print(f"订单语音播报失败: {e}")
+            logger.exception("订单语音播报失败: %s", e)
             return None
 
+    async def _run_in_executor(self, func, *args, **kwargs):
+        """
+        在默认线程池中执行同步调用，复用客户端的连接池
+
+        Args:
+            func: 同步方法
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            同步方法的返回值
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
     def set_auto_voice_mode(self, sn: str, voice_type: str = "MANDARIN_FEMALE",
                            voice_contents: List[str] = None) -> Dict[str, Any]:
         """
@@ -238,7 +627,7 @@ class VoiceService:
         Returns:
             API响应数据
         """
-        return self.play_voice(sn, f"TEST_{voice_type}")
+        return self.play_voice(sn, _voice_tag("TEST", voice_type))
 
     def _format_amount_voice(self, amount: float) -> str:
         """
@@ -252,34 +641,64 @@ class VoiceService:
         """
         # 将金额转换为中文语音格式
         # 例如：25.8 -> "二十五元八角"
-        amount_str = str(amount)
+        amount_str = format(amount, ".2f")
 
         # 这里需要根据实际的语音播报格式来格式化
         # 目前返回原格式，实际需要配合云平台的具体要求
         return amount_str
 
-    def get_voice_settings(self, sn: str) -> Dict[str, Any]:
+    def get_voice_settings(self, sn: str, refresh: bool = False) -> Dict[str, Any]:
         """
         获取语音设置信息
 
+        同一打印机的查询结果缓存SETTINGS_TTL秒，期间重复调用不再请求云平台
+
         Args:
             sn: 打印机编号
+            refresh: 是否忽略缓存重新查询
 
         Returns:
             语音设置信息
         """
+        now = time.monotonic()
+        if not refresh:
+            cached = self._settings_cache.get(sn)
+            if cached is not None and cached[0] > now:
+                # 返回副本，调用方修改结果不影响缓存
+                return cached[1].copy()
+
         # 获取打印机状态来分析语音设置
         status = self.client.query_printer_status(sn)
 
         data = status.get("data", {})
+        get = data.get
+
+        current_voice_type = get("voiceType", 0)
+        settings = self._SETTINGS_TEMPLATE.copy()
+        settings["is_voice_enabled"] = get("voiceEnabled", False)
+        settings["current_voice_type"] = current_voice_type
+        settings["current_voice_name"] = name_for_voice_type(current_voice_type)
+        settings["voice_quality"] = get("voiceQuality", "normal")
+        settings["last_voice_update"] = get("lastVoiceUpdate")
+        self._cache_settings(sn, settings, now)
+        return settings.copy()
+
+    def _cache_settings(self, sn: str, settings: Dict[str, Any], now: float) -> None:
+        """
+        缓存语音设置，超出容量时先清理过期项，仍然不足再淘汰最早缓存的一项
 
-        return {
-            "is_voice_enabled": data.get("voiceEnabled", False),
-            "current_voice_type": data.get("voiceType", 0),
-            "voice_quality": data.get("voiceQuality", "normal"),
-            "last_voice_update": data.get("lastVoiceUpdate"),
-            "supported_voices": list(self.VOICE_TYPES.keys())
-        }
+        Args:
+            sn: 打印机编号
+            settings: 语音设置信息
+            now: 当前单调时间
+        """
+        cache = self._settings_cache
+        if sn not in cache and len(cache) >= self.SETTINGS_CACHE_SIZE:
+            for key in [key for key, (expires, _) in cache.items() if expires <= now]:
+                cache.pop(key, None)
+            if len(cache) >= self.SETTINGS_CACHE_SIZE:
+                cache.pop(next(iter(cache)), None)
+        cache[sn] = (now + self.SETTINGS_TTL, settings)
 
     def validate_voice_support(self, sn: str) -> bool:
         """
@@ -297,39 +716,39 @@ class VoiceService:
     # 预定义的语音类型快捷方法
     def play_chinese_female(self, sn: str, message_type: str, **kwargs) -> Dict[str, Any]:
         """播放中文女声"""
-        return self.play_voice(sn, f"FEMALE_{message_type}", **kwargs)
+        return self.play_voice(sn, _voice_tag("FEMALE", message_type), **kwargs)
 
     def play_chinese_male(self, sn: str, message_type: str, **kwargs) -> Dict[str, Any]:
         """播放中文男声"""
-        return self.play_voice(sn, f"MALE_{message_type}", **kwargs)
+        return self.play_voice(sn, _voice_tag("MALE", message_type), **kwargs)
 
     def play_cantonese(self, sn: str, message_type: str, is_female: bool = True, **kwargs) -> Dict[str, Any]:
         """播放粤语"""
-        gender = "FEMALE" if is_female else "MALE"
-        return self.play_voice(sn, f"CANTONESE_{gender}_{message_type}", **kwargs)
+        speaker = "CANTONESE_FEMALE" if is_female else "CANTONESE_MALE"
+        return self.play_voice(sn, _voice_tag(speaker, message_type), **kwargs)
 
     def play_english(self, sn: str, message_type: str, is_female: bool = True, **kwargs) -> Dict[str, Any]:
         """播放英文"""
-        gender = "FEMALE" if is_female else "MALE"
-        return self.play_voice(sn, f"ENGLISH_{gender}_{message_type}", **kwargs)
+        speaker = "ENGLISH_FEMALE" if is_female else "ENGLISH_MALE"
+        return self.play_voice(sn, _voice_tag(speaker, message_type), **kwargs)
 
     # 常用业务语音快捷方法
     def play_new_order_voice(self, sn: str, voice_type: str = "FEMALE") -> Dict[str, Any]:
         """播放新订单语音"""
-        return self.play_voice(sn, f"{voice_type}_NEW_ORDER")
+        return self.play_voice(sn, _voice_tag(voice_type, "NEW_ORDER"))
 
     def play_complete_order_voice(self, sn: str, voice_type: str = "FEMALE") -> Dict[str, Any]:
         """播放订单完成语音"""
-        return self.play_voice(sn, f"{voice_type}_COMPLETE_ORDER")
+        return self.play_voice(sn, _voice_tag(voice_type, "COMPLETE_ORDER"))
 
     def play_error_voice(self, sn: str, voice_type: str = "FEMALE") -> Dict[str, Any]:
         """播放错误语音"""
-        return self.play_voice(sn, f"{voice_type}_ERROR")
+        return self.play_voice(sn, _voice_tag(voice_type, "ERROR"))
 
     def play_no_paper_voice(self, sn: str, voice_type: str = "FEMALE") -> Dict[str, Any]:
         """播放缺纸语音"""
-        return self.play_voice(sn, f"{voice_type}_NO_PAPER")
+        return self.play_voice(sn, _voice_tag(voice_type, "NO_PAPER"))
 
     def play_low_battery_voice(self, sn: str, voice_type: str = "FEMALE") -> Dict[str, Any]:
         """播放低电量语音"""
-        return self.play_voice(sn, f"{voice_type}_LOW_BATTERY")
\ No newline at end of file
+        return self.play_voice(sn, _voice_tag(voice_type, "LOW_BATTERY"))
\ No newline at end of file